@@ -97,7 +97,7 @@ def write_zip(
                     sys_path = src_fs.getsyspath(path)
                 except NoSysPath:
                     # Write from bytes
-                    _zip.writestr(zip_info, src_fs.readbytes(path))
+                    _zip.writestr(zip_info, src_fs.readbytes(path), compression)
                 else:
                     # Write from a file which is (presumably)
                     # more memory efficient
@@ -6,3 +6,10 @@ import io
 DEFAULT_CHUNK_SIZE = io.DEFAULT_BUFFER_SIZE * 16
 """`int`: the size of a single chunk read from or written to a file.
 """
+
+DEFAULT_BUFFER_SIZE = 128 * 1024
+"""`int`: the default buffer size used when wrapping a binary file.
+
+Pass an explicit ``buffering`` size to `~fs.base.FS.open` (or to
+`~fs.iotools.make_stream`) to override it for a single file.
+"""
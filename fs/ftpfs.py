@@ -250,7 +250,7 @@ class FTPFile(io.RawIOBase):
 
     def readline(self, size=None):
         # type: (Optional[int]) -> bytes
-        return next(line_iterator(self, size))  # type: ignore
+        return next(line_iterator(self, size), b"")  # type: ignore
 
     def readlines(self, hint=-1):
         # type: (int) -> List[bytes]
@@ -9,6 +9,7 @@ import array
 import io
 from io import SEEK_CUR, SEEK_SET
 
+from .constants import DEFAULT_BUFFER_SIZE
 from .mode import Mode
 
 if typing.TYPE_CHECKING:
@@ -160,7 +161,17 @@ def make_stream(
     **kwargs  # type: Any
 ):
     # type: (...) -> IO
-    """Take a Python 2.x binary file and return an IO Stream."""
+    """Take a Python 2.x binary file and return an IO Stream.
+
+    If ``buffering`` is ``0``, the binary file is wrapped in a buffer
+    of `~fs.constants.DEFAULT_BUFFER_SIZE` bytes (unless it is already
+    buffered); any positive value is used as the buffer size instead.
+    Text files are returned unchanged when a text mode is requested.
+
+    """
+    if "b" not in mode and isinstance(bin_file, io.TextIOBase):
+        return bin_file
+
     reading = "r" in mode
     writing = "w" in mode
     appending = "a" in mode
@@ -172,21 +183,24 @@ def make_stream(
     encoding = None if binary else (encoding or "utf-8")
 
     io_object = RawWrapper(bin_file, mode=mode, name=name)  # type: io.IOBase
-    if buffering >= 0:
+    # NOTE: `FS.open` forwards `buffering` to `openbin`, so this only applies
+    #       to filesystems whose `openbin` returns a buffered file regardless
+    buffered = buffering == 0 and isinstance(bin_file, io.BufferedIOBase)
+    if buffering >= 0 and not buffered:
         if reading and writing:
             io_object = io.BufferedRandom(
                 typing.cast(io.RawIOBase, io_object),
-                buffering or io.DEFAULT_BUFFER_SIZE,
+                buffering or DEFAULT_BUFFER_SIZE,
             )
         elif reading:
             io_object = io.BufferedReader(
                 typing.cast(io.RawIOBase, io_object),
-                buffering or io.DEFAULT_BUFFER_SIZE,
+                buffering or DEFAULT_BUFFER_SIZE,
             )
         elif writing or appending:
             io_object = io.BufferedWriter(
                 typing.cast(io.RawIOBase, io_object),
-                buffering or io.DEFAULT_BUFFER_SIZE,
+                buffering or DEFAULT_BUFFER_SIZE,
             )
 
     if not binary:
@@ -205,29 +219,55 @@ def line_iterator(readable_file, size=None):
     # type: (IO[bytes], Optional[int]) -> Iterator[bytes]
     """Iterate over the lines of a file.
 
-    Implementation reads each char individually, which is not very
-    efficient.
+    Buffered binary streams (such as `io.BufferedReader` or `io.BytesIO`)
+    are split using their own ``readline`` method. Other streams are
+    read one byte at a time, so that no data is consumed past the end
+    of the last line returned.
+
+    Arguments:
+        readable_file (io.IOBase): A readable binary file.
+        size (int, optional): The maximum number of bytes to read,
+            or `None` to read the whole file.
 
     Yields:
-        str: a single line in the file.
+        bytes: a single line in the file.
 
     """
+    if isinstance(readable_file, io.BufferedIOBase):
+        readline = readable_file.readline
+        if size is None or size < 0:
+            for line in iter(readline, b""):
+                yield line
+        else:
+            while size > 0:
+                line = readline(size)
+                if not line:
+                    break
+                size -= len(line)
+                yield line
+        return
+
     read = readable_file.read
-    line = []
-    byte = b"1"
+    buf = bytearray()
     if size is None or size < 0:
+        byte = read(1)
         while byte:
+            buf += byte
+            if byte == b"\n":
+                yield bytes(buf)
+                del buf[:]
             byte = read(1)
-            line.append(byte)
-            if byte in b"\n":
-                yield b"".join(line)
-                del line[:]
 
     else:
-        while byte and size:
+        while size:
             byte = read(1)
+            if not byte:
+                break
             size -= len(byte)
-            line.append(byte)
-            if byte in b"\n" or not size:
-                yield b"".join(line)
-                del line[:]
+            buf += byte
+            if byte == b"\n" or not size:
+                yield bytes(buf)
+                del buf[:]
+
+    if buf:
+        yield bytes(buf)
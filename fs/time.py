@@ -13,14 +13,47 @@ try:
 except ImportError:
     from ._tzcompat import timezone  # type: ignore
 
+try:
+    from functools import lru_cache
+except ImportError:  # pragma: no cover
+
+    def lru_cache(maxsize=128):  # type: ignore
+        """Do not cache anything on Python 2, which lacks `lru_cache`."""
+        return lambda func: func
+
+
 if typing.TYPE_CHECKING:
-    from typing import Optional
+    from typing import Optional, Tuple
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 
 def datetime_to_epoch(d):
     # type: (datetime) -> int
-    """Convert datetime to epoch."""
-    return timegm(d.utctimetuple())
+    """Convert datetime to epoch.
+
+    Naive datetimes are assumed to be in UTC.
+
+    """
+    if d.utcoffset() is None:
+        return timegm(d.utctimetuple())
+    # NOTE: this is `timegm(d.utctimetuple())` without the intermediate
+    #       `struct_time`, microseconds are discarded in the same way
+    delta = d - _EPOCH
+    return delta.days * 86400 + delta.seconds
+
+
+def zip_dos_to_epoch(date_time):
+    # type: (Tuple[int, int, int, int, int, int]) -> int
+    """Convert the ``date_time`` of a `zipfile.ZipInfo` to epoch.
+
+    The date and time are assumed to be in UTC, which is equivalent to
+    ``datetime_to_epoch(datetime(*date_time))`` but does not create any
+    intermediate `~datetime.datetime` object.
+
+    """
+    return timegm(tuple(date_time) + (0, 0, 0))
 
 
 @typing.overload
@@ -35,6 +68,11 @@ def epoch_to_datetime(t):  # noqa: D103
     pass
 
 
+# NOTE: this conversion is cached since sibling files (for instance in an
+#       archive or a build directory) often share the same timestamps. The
+#       reverse conversion is not, since datetimes comparing equal (such as
+#       ones differing only by `fold`) may be different instants.
+@lru_cache(maxsize=4096)  # type: ignore
 def epoch_to_datetime(t):
     # type: (Optional[int]) -> Optional[datetime]
     """Convert epoch time to a UTC datetime."""
@@ -6,22 +6,25 @@ from __future__ import print_function, unicode_literals
 import sys
 import typing
 
+import io
+import mmap
 import six
 import zipfile
-from datetime import datetime
 
 from . import errors
 from ._url_tools import url_quote
 from .base import FS
+from .constants import DEFAULT_BUFFER_SIZE
 from .compress import write_zip
 from .enums import ResourceType, Seek
 from .info import Info
 from .iotools import RawWrapper
+from .lrucache import LRUCache
 from .memoryfs import MemoryFS
 from .opener import open_fs
-from .path import dirname, forcedir, normpath, relpath
+from .path import abspath, basename, forcedir, normpath, relpath, split
 from .permissions import Permissions
-from .time import datetime_to_epoch
+from .time import zip_dos_to_epoch
 from .wrapfs import WrapFS
 
 if typing.TYPE_CHECKING:
@@ -30,8 +33,10 @@ if typing.TYPE_CHECKING:
         BinaryIO,
         Collection,
         Dict,
+        Iterator,
         List,
         Optional,
+        Set,
         SupportsInt,
         Text,
         Tuple,
@@ -44,13 +49,72 @@ if typing.TYPE_CHECKING:
     R = typing.TypeVar("R", bound="ReadZipFS")
 
 
+# Namespaces of `ReadZipFS.getinfo` which need the `ZipInfo` of a resource
+_ZIP_INFO_NAMESPACES = frozenset(("details", "access", "zip"))
+
+# Public attributes of a `ZipInfo`, exposed in the *zip* namespace
+_ZIP_INFO_ATTRIBUTES = tuple(
+    k for k in zipfile.ZipInfo.__slots__ if not k.startswith("_")  # type: ignore
+)
+
+_DIRECTORY_TYPE = int(ResourceType.directory)
+_FILE_TYPE = int(ResourceType.file)
+
+
+# Serialized permissions, by mode (there are at most 4096 of them)
+_PERMISSIONS_CACHE = {}  # type: Dict[int, List[Text]]
+
+
+def _dump_permissions(mode):
+    # type: (int) -> List[Text]
+    """Get the serialized `Permissions` for the given mode."""
+    dump = _PERMISSIONS_CACHE.get(mode)
+    if dump is None:
+        dump = _PERMISSIONS_CACHE[mode] = Permissions(mode=mode).dump()
+    # return a copy, since `Info` exposes the raw (mutable) namespaces
+    return list(dump)
+
+
+def _add_zip_namespaces(
+    raw_info,  # type: Dict[Text, Dict[Text, object]]
+    zip_info,  # type: zipfile.ZipInfo
+    is_dir,  # type: bool
+    namespaces,  # type: Collection[Text]
+):
+    # type: (...) -> None
+    """Add the namespaces obtained from a `ZipInfo` to ``raw_info``."""
+    if "details" in namespaces:
+        raw_info["details"] = {
+            "size": zip_info.file_size,
+            "type": _DIRECTORY_TYPE if is_dir else _FILE_TYPE,
+            "modified": zip_dos_to_epoch(zip_info.date_time),
+        }
+    if "zip" in namespaces:
+        raw_info["zip"] = {k: getattr(zip_info, k) for k in _ZIP_INFO_ATTRIBUTES}
+    if "access" in namespaces:
+        # check the zip was created on UNIX to get permissions
+        if zip_info.external_attr and zip_info.create_system == 3:
+            raw_info["access"] = {
+                "permissions": _dump_permissions(zip_info.external_attr >> 16 & 0xFFF)
+            }
+
+
 class _ZipExtFile(RawWrapper):
     def __init__(self, fs, name):  # noqa: D107
         # type: (ReadZipFS, Text) -> None
+        self._fs = fs
         self._zip = _zip = fs._zip
         self._end = _zip.getinfo(name).file_size
         self._pos = 0
         super(_ZipExtFile, self).__init__(_zip.open(name), "r", name)
+        with fs._lock:
+            fs._open_files += 1
+
+    def close(self):
+        # type: () -> None
+        if not self.closed:
+            super(_ZipExtFile, self).close()
+            self._fs._release_file()
 
     # NOTE(@althonos): Starting from Python 3.7, files inside a Zip archive are
     #                  seekable provided they were opened from a seekable file
@@ -332,7 +396,21 @@ class WriteZipFS(WrapFS):
 
 @six.python_2_unicode_compatible
 class ReadZipFS(FS):
-    """A readable zip file."""
+    """A readable zip file.
+
+    Arguments:
+        file (str or io.IOBase): An OS filename, or an open file object.
+        encoding (str): The encoding to use for filenames.
+        use_mmap (bool): Set to `True` to memory-map the archive when
+            ``file`` is a filename, instead of reading it with regular
+            file reads. Ignored on Windows. The archive must not be
+            truncated while it is mapped. The mapping is released when
+            the filesystem and every file opened from it are closed.
+
+    """
+
+    # maximum number of members kept open by `read_range`
+    _RANGE_FILES_CACHE_SIZE = 16
 
     _meta = {
         "case_insensitive": False,
@@ -345,13 +423,40 @@ class ReadZipFS(FS):
     }
 
     @errors.CreateFailed.catch_all
-    def __init__(self, file, encoding="utf-8"):  # noqa: D107
-        # type: (Union[BinaryIO, Text], Text) -> None
+    def __init__(self, file, encoding="utf-8", use_mmap=False):  # noqa: D107
+        # type: (Union[BinaryIO, Text], Text, bool) -> None
         super(ReadZipFS, self).__init__()
         self._file = file
         self.encoding = encoding
-        self._zip = zipfile.ZipFile(file, "r")
+        self._mmap = None  # type: Optional[mmap.mmap]
+        # number of members opened with `openbin` and not closed yet
+        self._open_files = 0
+        zip_file = file  # type: Union[BinaryIO, Text]
+        if use_mmap and isinstance(file, six.string_types) and sys.platform != "win32":
+            with open(file, "rb") as handle:
+                self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            # `mmap` objects do not implement `seekable` before Python 3.13
+            zip_file = RawWrapper(self._mmap, mode="rb", name=file)  # type: ignore
+        try:
+            self._zip = zipfile.ZipFile(zip_file, "r")
+        except Exception:
+            if self._mmap is not None:
+                self._mmap.close()
+            raise
+        self._name_to_info = self._zip.NameToInfo
+        self._children = None  # type: Optional[Dict[Text, List[Text]]]
+        self._files = set()  # type: Set[Text]
         self._directory_fs = None  # type: Optional[MemoryFS]
+        # open members kept by `read_range` to serve sequential ranges
+        self._range_files = LRUCache(
+            self._RANGE_FILES_CACHE_SIZE
+        )  # type: LRUCache[Text, _ZipExtFile]
+        try:
+            self._build_index()
+        except errors.IllegalBackReference:
+            # the archive contains invalid names, errors will only
+            # be raised when attempting to access its contents
+            pass
 
     def __repr__(self):
         # type: () -> Text
@@ -361,35 +466,124 @@ class ReadZipFS(FS):
         # type: () -> Text
         return "<zipfs '{}'>".format(self._file)
 
-    def _path_to_zip_name(self, path):
+    def _path_to_zip_name(self, _path):
         # type: (Text) -> str
-        """Convert a path to a zip file name."""
-        path = relpath(normpath(path))
-        if self._directory.isdir(path):
-            path = forcedir(path)
+        """Convert a validated (normalized and absolute) path to a zip file name."""
+        zip_name = _path[1:]
+        if _path in self._index:
+            zip_name += "/"
         if six.PY2:
-            return path.encode(self.encoding)
-        return path
+            return zip_name.encode(self.encoding)
+        return zip_name
+
+    def _build_index(self):
+        # type: () -> None
+        """Index the folder hierarchy of the zip.
+
+        The index maps every directory (including the implied ones)
+        to the names of its children, and records the path of every
+        file in the archive.
+
+        """
+        children = {"/": []}  # type: Dict[Text, List[Text]]
+        files = set()  # type: Set[Text]
+        # prebind the functions used in the loop
+        _abspath, _normpath, _split = abspath, normpath, split
+        add_file, discard_file = files.add, files.discard
+
+        for zip_name in self._zip.namelist():
+            resource_name = zip_name
+            if six.PY2:
+                resource_name = resource_name.decode(self.encoding, "replace")
+            path = _abspath(_normpath(resource_name))
+            if resource_name.endswith("/"):
+                parent_path, name = path, None
+            else:
+                parent_path, name = _split(path)
+
+            dir_path = parent_path
+            missing = []
+            while dir_path not in children:
+                head, tail = _split(dir_path)
+                missing.append((head, tail, dir_path))
+                dir_path = head
+            for head, tail, dir_path in reversed(missing):
+                if dir_path in files:
+                    # a directory shadows a file with the same name
+                    discard_file(dir_path)
+                else:
+                    children[head].append(tail)
+                children[dir_path] = []
+
+            if name is not None and path not in files and path not in children:
+                children[parent_path].append(name)
+                add_file(path)
+
+        self._files = files
+        self._children = children
+
+    @property
+    def _index(self):
+        # type: () -> Dict[Text, List[Text]]
+        """`dict`: a mapping of every directory to the names it contains."""
+        children = self._children
+        if children is None:
+            with self._lock:
+                if self._children is None:
+                    self._build_index()
+                children = self._children
+        return children  # type: ignore
 
     @property
     def _directory(self):
         # type: () -> MemoryFS
-        """`MemoryFS`: a filesystem with the same folder hierarchy as the zip."""
-        self.check()
+        """`MemoryFS`: a filesystem with the same folder hierarchy as the zip.
+
+        Note:
+            This is only kept for compatibility, `ReadZipFS` now uses
+            a lightweight index of the archive instead.
+
+        """
+        index = self._index
         with self._lock:
             if self._directory_fs is None:
                 self._directory_fs = _fs = MemoryFS()
-                for zip_name in self._zip.namelist():
-                    resource_name = zip_name
-                    if six.PY2:
-                        resource_name = resource_name.decode(self.encoding, "replace")
-                    if resource_name.endswith("/"):
-                        _fs.makedirs(resource_name, recreate=True)
-                    else:
-                        _fs.makedirs(dirname(resource_name), recreate=True)
-                        _fs.create(resource_name)
+                for dir_path in index:
+                    _fs.makedirs(dir_path, recreate=True)
+                for file_path in self._files:
+                    _fs.create(file_path)
             return self._directory_fs
 
+    def validatepath(self, path):
+        # type: (Text) -> Text
+        """Check the path is valid, without the checks a zip does not need."""
+        if self._closed:
+            raise errors.FilesystemClosed()
+        if isinstance(path, bytes):
+            raise TypeError(
+                "paths must be unicode (not str)"
+                if six.PY2
+                else "paths must be str (not bytes)"
+            )
+        return abspath(normpath(path))
+
+    def exists(self, path):
+        # type: (Text) -> bool
+        _path = self.validatepath(path)
+        return _path in self._index or _path in self._files
+
+    def isdir(self, path):
+        # type: (Text) -> bool
+        _path = self.validatepath(path)
+        return _path in self._index
+
+    def isfile(self, path):
+        # type: (Text) -> bool
+        _path = self.validatepath(path)
+        # NOTE: `self._index` is checked first so that the index is built
+        #       (and indexing errors are raised) before `self._files` is used
+        return _path not in self._index and _path in self._files
+
     def getinfo(self, path, namespaces=None):
         # type: (Text, Optional[Collection[Text]]) -> Info
         _path = self.validatepath(path)
@@ -399,46 +593,20 @@ class ReadZipFS(FS):
         if _path == "/":
             raw_info["basic"] = {"name": "", "is_dir": True}
             if "details" in namespaces:
-                raw_info["details"] = {"type": int(ResourceType.directory)}
+                raw_info["details"] = {"type": _DIRECTORY_TYPE}
 
         else:
-            basic_info = self._directory.getinfo(_path)
-            raw_info["basic"] = {"name": basic_info.name, "is_dir": basic_info.is_dir}
-
-            if not {"details", "access", "zip"}.isdisjoint(namespaces):
-                zip_name = self._path_to_zip_name(path)
-                try:
-                    zip_info = self._zip.getinfo(zip_name)
-                except KeyError:
-                    # Can occur if there is an implied directory in the zip
-                    pass
-                else:
-                    if "details" in namespaces:
-                        raw_info["details"] = {
-                            "size": zip_info.file_size,
-                            "type": int(
-                                ResourceType.directory
-                                if basic_info.is_dir
-                                else ResourceType.file
-                            ),
-                            "modified": datetime_to_epoch(
-                                datetime(*zip_info.date_time)
-                            ),
-                        }
-                    if "zip" in namespaces:
-                        raw_info["zip"] = {
-                            k: getattr(zip_info, k)
-                            for k in zip_info.__slots__  # type: ignore
-                            if not k.startswith("_")
-                        }
-                    if "access" in namespaces:
-                        # check the zip was created on UNIX to get permissions
-                        if zip_info.external_attr and zip_info.create_system == 3:
-                            raw_info["access"] = {
-                                "permissions": Permissions(
-                                    mode=zip_info.external_attr >> 16 & 0xFFF
-                                ).dump()
-                            }
+            is_dir = _path in self._index
+            if not is_dir and _path not in self._files:
+                raise errors.ResourceNotFound(path)
+            raw_info["basic"] = {"name": basename(_path), "is_dir": is_dir}
+
+            if not _ZIP_INFO_NAMESPACES.isdisjoint(namespaces):
+                zip_name = self._path_to_zip_name(_path)
+                zip_info = self._name_to_info.get(zip_name)
+                # `zip_info` is `None` if there is an implied directory in the zip
+                if zip_info is not None:
+                    _add_zip_namespaces(raw_info, zip_info, is_dir, namespaces)
 
         return Info(raw_info)
 
@@ -449,8 +617,55 @@ class ReadZipFS(FS):
 
     def listdir(self, path):
         # type: (Text) -> List[Text]
-        self.check()
-        return self._directory.listdir(path)
+        _path = self.validatepath(path)
+        index = self._index
+        if _path not in index:
+            if _path in self._files:
+                raise errors.DirectoryExpected(path)
+            raise errors.ResourceNotFound(path)
+        return list(index[_path])
+
+    def scandir(
+        self,
+        path,  # type: Text
+        namespaces=None,  # type: Optional[Collection[Text]]
+        page=None,  # type: Optional[Tuple[int, int]]
+    ):
+        # type: (...) -> Iterator[Info]
+        _path = self.validatepath(path)
+        index = self._index
+        if _path not in index:
+            if _path in self._files:
+                raise errors.DirectoryExpected(path)
+            raise errors.ResourceNotFound(path)
+
+        namespaces = namespaces or ()
+        names = index[_path]
+        if page is not None:
+            start, end = page
+            names = names[start:end]
+
+        # resolve everything that is the same for all the entries once
+        need_zip_info = not _ZIP_INFO_NAMESPACES.isdisjoint(namespaces)
+        get_zip_info = self._name_to_info.get
+        dir_prefix = forcedir(_path)
+        zip_prefix = relpath(dir_prefix)
+
+        for name in names:
+            is_dir = dir_prefix + name in index
+            raw_info = {}  # type: Dict[Text, Dict[Text, object]]
+            raw_info["basic"] = {"name": name, "is_dir": is_dir}
+            if need_zip_info:
+                zip_name = zip_prefix + name
+                if is_dir:
+                    zip_name += "/"
+                if six.PY2:
+                    zip_name = zip_name.encode(self.encoding)
+                zip_info = get_zip_info(zip_name)
+                # `zip_info` is `None` if there is an implied directory in the zip
+                if zip_info is not None:
+                    _add_zip_namespaces(raw_info, zip_info, is_dir, namespaces)
+            yield Info(raw_info)
 
     def makedir(
         self,  # type: R
@@ -468,13 +683,19 @@ class ReadZipFS(FS):
         if "w" in mode or "+" in mode or "a" in mode:
             raise errors.ResourceReadOnly(path)
 
-        if not self._directory.exists(path):
-            raise errors.ResourceNotFound(path)
-        elif self._directory.isdir(path):
+        _path = self.validatepath(path)
+        if _path in self._index:
             raise errors.FileExpected(path)
+        elif _path not in self._files:
+            raise errors.ResourceNotFound(path)
 
-        zip_name = self._path_to_zip_name(path)
-        return _ZipExtFile(self, zip_name)  # type: ignore
+        zip_name = self._path_to_zip_name(_path)
+        zip_file = _ZipExtFile(self, zip_name)
+        if buffering == 0:
+            return zip_file  # type: ignore
+        return io.BufferedReader(  # type: ignore
+            zip_file, buffering if buffering > 0 else DEFAULT_BUFFER_SIZE
+        )
 
     def remove(self, path):
         # type: (Text) -> None
@@ -489,18 +710,108 @@ class ReadZipFS(FS):
     def close(self):
         # type: () -> None
         super(ReadZipFS, self).close()
+        if hasattr(self, "_range_files"):
+            with self._lock:
+                for zip_file in self._range_files.values():
+                    zip_file.close()
+                self._range_files.clear()
         if hasattr(self, "_zip"):
             self._zip.close()
+        mapping = getattr(self, "_mmap", None)  # type: Optional[mmap.mmap]
+        if mapping is not None:
+            with self._lock:
+                # NOTE: open members keep reading from the mapping, so it
+                #       is only closed once the last of them is closed
+                if not self._open_files:
+                    mapping.close()
+
+    def _release_file(self):
+        # type: () -> None
+        """Record a member opened with `openbin` was closed."""
+        with self._lock:
+            self._open_files -= 1
+            if self._closed and not self._open_files and self._mmap is not None:
+                self._mmap.close()
 
-    def readbytes(self, path):
-        # type: (Text) -> bytes
-        self.check()
-        if not self._directory.isfile(path):
+    def readbytes(self, path, size=None):
+        # type: (Text, Optional[int]) -> bytes
+        """Get the contents of a file as bytes.
+
+        Arguments:
+            path (str): A path to a readable file on the filesystem.
+            size (int, optional): The maximum number of bytes to read,
+                or `None` to read the whole file. Decompression stops
+                as soon as ``size`` bytes are available.
+
+        Returns:
+            bytes: the file contents.
+
+        Raises:
+            fs.errors.ResourceNotFound: if ``path`` is not a file.
+
+        """
+        _path = self.validatepath(path)
+        if _path in self._index or _path not in self._files:
             raise errors.ResourceNotFound(path)
-        zip_name = self._path_to_zip_name(path)
-        zip_bytes = self._zip.read(zip_name)
+        zip_info = self._name_to_info[self._path_to_zip_name(_path)]
+        if size is not None and size >= 0:
+            with self._zip.open(zip_info) as zip_file:
+                return zip_file.read(size)
+        # NOTE: passing the `ZipInfo` avoids a second lookup in `ZipFile.open`;
+        #       `ZipFile.read` is already the fastest way to decompress a whole
+        #       member, since `ZipExtFile.readinto` is emulated with `read`.
+        zip_bytes = self._zip.read(zip_info)
         return zip_bytes
 
+    def read_range(self, path, offset, length):
+        # type: (Text, int, int) -> bytes
+        """Get a range of bytes from a file.
+
+        The member is decompressed up to ``offset + length`` bytes,
+        without keeping the data before ``offset`` in memory. The open
+        member is kept afterwards, so that a request starting where the
+        previous one ended resumes decompression instead of restarting
+        it from the beginning of the member.
+
+        Arguments:
+            path (str): A path to a readable file on the filesystem.
+            offset (int): The position of the first byte to read.
+            length (int): The maximum number of bytes to read.
+
+        Returns:
+            bytes: the contents of the file in the given range.
+
+        Raises:
+            fs.errors.FileExpected: if ``path`` is a directory.
+            fs.errors.ResourceNotFound: if ``path`` does not exist.
+            ValueError: if ``offset`` or ``length`` is negative.
+
+        """
+        if offset < 0 or length < 0:
+            raise ValueError("offset and length must be >= 0")
+        _path = self.validatepath(path)
+        with self._lock:
+            zip_file = self._range_files.pop(_path, None)
+        if zip_file is None:
+            zip_file = self.openbin(_path, buffering=0)
+        # NOTE: seeking forward only decompresses the bytes between the
+        #       current position and `offset`, seeking backward restarts
+        #       decompression from the start of the member.
+        try:
+            zip_file.seek(offset)
+            data = zip_file.read(length)
+        except Exception:
+            zip_file.close()
+            raise
+        with self._lock:
+            if self._closed or _path in self._range_files:
+                zip_file.close()
+            else:
+                if len(self._range_files) >= self._range_files.cache_size:
+                    self._range_files.popitem(last=False)[1].close()
+                self._range_files[_path] = zip_file
+        return data
+
     def geturl(self, path, purpose="download"):
         # type: (Text, Text) -> Text
         if purpose == "fs" and isinstance(self._file, six.string_types):
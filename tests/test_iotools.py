@@ -134,6 +134,37 @@ class TestIOTools(unittest.TestCase):
         f = io.BytesIO(b"Hello\nWorld\n\nfoo")
         self.assertEqual(list(iotools.line_iterator(f, 10)), [b"Hello\n", b"Worl"])
 
+    def test_line_iterator_raw(self):
+        class RawBytes(io.RawIOBase):
+            def __init__(self, data):
+                self._f = io.BytesIO(data)
+
+            def readable(self):
+                return True
+
+            def readinto(self, b):
+                return self._f.readinto(b)
+
+        for data in (b"Hello\nWorld\n\nfoo", b"Hello\nWorld\n", b""):
+            for size in (None, 3, 10, 100):
+                buffered = list(iotools.line_iterator(io.BytesIO(data), size))
+                raw = list(iotools.line_iterator(RawBytes(data), size))
+                self.assertEqual(buffered, raw)
+
+        f = RawBytes(b"Hello\nWorld\n")
+        self.assertEqual(next(iotools.line_iterator(f)), b"Hello\n")
+        self.assertEqual(f.read(), b"World\n")
+
+    def test_make_stream_text(self):
+        f = io.StringIO("Hello")
+        self.assertIs(iotools.make_stream("foo", f, "r"), f)
+
+    def test_make_stream_buffered(self):
+        f = io.BytesIO(b"Hello")
+        s = iotools.make_stream("foo", f, "rb", buffering=0)
+        self.assertNotIsInstance(s, io.BufferedReader)
+        self.assertEqual(s.read(), b"Hello")
+
     def test_make_stream_writer(self):
         f = io.BytesIO()
         s = iotools.make_stream("foo", f, "wb", buffering=1)
@@ -1,9 +1,11 @@
 from __future__ import print_function, unicode_literals
 
+import sys
 import unittest
-from datetime import datetime
+from calendar import timegm
+from datetime import datetime, timedelta, tzinfo
 
-from fs.time import datetime_to_epoch, epoch_to_datetime
+from fs.time import datetime_to_epoch, epoch_to_datetime, zip_dos_to_epoch
 
 try:
     from datetime import timezone
@@ -11,6 +13,33 @@ except ImportError:
     from fs._tzcompat import timezone  # type: ignore
 
 
+class _Offset(tzinfo):
+    def __init__(self, hours):
+        self._offset = timedelta(hours=hours)
+
+    def utcoffset(self, dt):
+        return self._offset
+
+    def dst(self, dt):
+        return timedelta(0)
+
+
+class _Unknown(tzinfo):
+    def utcoffset(self, dt):
+        return None
+
+    def dst(self, dt):
+        return None
+
+
+class _Fold(tzinfo):
+    def utcoffset(self, dt):
+        return timedelta(hours=-5 if dt.fold else -4)
+
+    def dst(self, dt):
+        return timedelta(0)
+
+
 class TestEpoch(unittest.TestCase):
     def test_epoch_to_datetime(self):
         self.assertEqual(
@@ -21,3 +50,33 @@ class TestEpoch(unittest.TestCase):
         self.assertEqual(
             datetime_to_epoch(datetime(1974, 7, 5, tzinfo=timezone.utc)), 142214400
         )
+
+    def test_datetime_to_epoch_timezones(self):
+        self.assertEqual(datetime_to_epoch(datetime(1974, 7, 5)), 142214400)
+        self.assertEqual(
+            datetime_to_epoch(datetime(1974, 7, 5, 2, tzinfo=_Offset(2))), 142214400
+        )
+        self.assertEqual(
+            datetime_to_epoch(datetime(1974, 7, 5, 1, tzinfo=_Unknown())), 142218000
+        )
+        before_epoch = datetime(1969, 12, 31, 23, 59, 59, 500000, tzinfo=timezone.utc)
+        self.assertEqual(
+            datetime_to_epoch(before_epoch), timegm(before_epoch.utctimetuple())
+        )
+
+    @unittest.skipIf(sys.version_info < (3, 6), "datetime.fold requires Python 3.6")
+    def test_datetime_to_epoch_fold(self):
+        first = datetime(2021, 11, 7, 1, 30, tzinfo=_Fold())
+        second = first.replace(fold=1)
+        self.assertEqual(datetime_to_epoch(first), 1636263000)
+        self.assertEqual(datetime_to_epoch(second), 1636266600)
+
+    def test_zip_dos_to_epoch(self):
+        self.assertEqual(zip_dos_to_epoch((1974, 7, 5, 0, 0, 0)), 142214400)
+        date_time = (2020, 2, 29, 13, 37, 58)
+        self.assertEqual(
+            zip_dos_to_epoch(date_time), datetime_to_epoch(datetime(*date_time))
+        )
+
+    def test_epoch_to_datetime_none(self):
+        self.assertIsNone(epoch_to_datetime(None))
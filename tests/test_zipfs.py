@@ -3,22 +3,30 @@ from __future__ import unicode_literals
 
 import sys
 
+import io
+import mmap
 import os
 import six
 import tempfile
 import unittest
 import zipfile
 
-from fs import zipfs
+from fs import errors, zipfs
 from fs.compress import write_zip
 from fs.enums import Seek
 from fs.errors import NoURL
 from fs.opener import open_fs
 from fs.opener.errors import NotWriteable
+from fs.path import join
 from fs.test import FSTestCases
 
 from .test_archives import ArchiveTestCases
 
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
 
 class TestWriteReadZipFS(unittest.TestCase):
     def setUp(self):
@@ -40,6 +48,16 @@ class TestWriteReadZipFS(unittest.TestCase):
                 with zip_fs.openbin(path) as f:
                     f.read()
 
+    def test_compression(self):
+        test_fs = open_fs("mem://")
+        test_fs.writebytes("test.bin", b"a" * 50000)
+        write_zip(test_fs, self._temp_path, compression=zipfile.ZIP_DEFLATED)
+
+        with zipfile.ZipFile(self._temp_path) as z:
+            zip_info = z.getinfo("test.bin")
+            self.assertEqual(zip_info.compress_type, zipfile.ZIP_DEFLATED)
+            self.assertLess(zip_info.compress_size, zip_info.file_size)
+
 
 class TestWriteZipFS(FSTestCases, unittest.TestCase):
     """
@@ -102,6 +120,11 @@ class TestReadZipFS(ArchiveTestCases, unittest.TestCase):
     def test_openbin(self):
         with self.fs.openbin("top.txt") as f:
             self.assertEqual(f.name, "top.txt")
+            self.assertIsInstance(f, io.BufferedReader)
+            self.assertEqual(f.readline(), b"Hello, World")
+        with self.fs.openbin("top.txt", buffering=0) as f:
+            self.assertNotIsInstance(f, io.BufferedReader)
+            self.assertEqual(f.read(), b"Hello, World")
         with self.fs.openbin("top.txt") as f:
             self.assertRaises(ValueError, f.seek, -2, Seek.set)
         with self.fs.openbin("top.txt") as f:
@@ -118,6 +141,36 @@ class TestReadZipFS(ArchiveTestCases, unittest.TestCase):
         with self.fs.openbin("top.txt") as f:
             self.assertEqual(f.read(12), b"Hello, World")
 
+    def test_readbytes_size(self):
+        self.assertEqual(self.fs.readbytes("top.txt", 5), b"Hello")
+        self.assertEqual(self.fs.readbytes("top.txt", 100), b"Hello, World")
+        self.assertEqual(self.fs.readbytes("top.txt", -1), b"Hello, World")
+        self.assertEqual(self.fs.readbytes("top.txt", 0), b"")
+
+    def test_read_range(self):
+        self.assertEqual(self.fs.read_range("top.txt", 0, 5), b"Hello")
+        self.assertEqual(self.fs.read_range("top.txt", 7, 5), b"World")
+        self.assertEqual(self.fs.read_range("top.txt", 7, 100), b"World")
+        self.assertEqual(self.fs.read_range("top.txt", 100, 5), b"")
+        with self.assertRaises(ValueError):
+            self.fs.read_range("top.txt", -1, 5)
+        with self.assertRaises(errors.ResourceNotFound):
+            self.fs.read_range("nothing.txt", 0, 5)
+        with self.assertRaises(errors.FileExpected):
+            self.fs.read_range("foo", 0, 5)
+
+    def test_read_range_sequential(self):
+        self.assertEqual(self.fs.read_range("top.txt", 0, 5), b"Hello")
+        zip_file = self.fs._range_files["/top.txt"]
+        self.assertEqual(self.fs.read_range("top.txt", 5, 2), b", ")
+        self.assertIs(self.fs._range_files["/top.txt"], zip_file)
+        self.assertEqual(self.fs.read_range("/top.txt", 0, 5), b"Hello")
+        self.assertEqual(self.fs.read_range("top.txt", 7, 5), b"World")
+        self.assertIs(self.fs._range_files["/top.txt"], zip_file)
+        self.fs.close()
+        self.assertFalse(self.fs._range_files)
+        self.assertTrue(zip_file.closed)
+
     def test_read1(self):
         with self.fs.openbin("top.txt") as f:
             self.assertEqual(f.read1(), b"Hello, World")
@@ -202,6 +255,40 @@ class TestReadZipFSMem(TestReadZipFS):
         return open_fs("mem://")
 
 
+class TestReadZipFSMmap(TestReadZipFS):
+    def load_archive(self):
+        return zipfs.ReadZipFS(self._temp_path, use_mmap=True)
+
+    @unittest.skipIf(sys.platform == "win32", "mmap is not used on Windows")
+    def test_close_with_open_files(self):
+        f = self.fs.openbin("top.txt")
+        self.fs.close()
+        self.assertFalse(self.fs._mmap.closed)
+        self.assertEqual(f.read(), b"Hello, World")
+        f.close()
+        self.assertTrue(self.fs._mmap.closed)
+
+    @unittest.skipIf(sys.platform == "win32", "mmap is not used on Windows")
+    def test_bad_archive(self):
+        fh, path = tempfile.mkstemp()
+        try:
+            os.write(fh, b"not a zip file")
+            os.close(fh)
+            mappings = []
+            mmap_type = mmap.mmap
+
+            def _mmap(*args, **kwargs):
+                mappings.append(mmap_type(*args, **kwargs))
+                return mappings[-1]
+
+            with mock.patch.object(zipfs.mmap, "mmap", _mmap):
+                with self.assertRaises(errors.CreateFailed):
+                    zipfs.ReadZipFS(path, use_mmap=True)
+            self.assertTrue(mappings[0].closed)
+        finally:
+            os.remove(path)
+
+
 class TestDirsZipFS(unittest.TestCase):
     def test_implied(self):
         """Test zipfs creates intermediate directories."""
@@ -219,6 +306,78 @@ class TestDirsZipFS(unittest.TestCase):
         finally:
             os.remove(path)
 
+    def test_index(self):
+        """Test zipfs indexes the archive hierarchy."""
+        fh, path = tempfile.mkstemp("testzip.zip")
+        try:
+            os.close(fh)
+            with zipfile.ZipFile(path, mode="w") as z:
+                z.writestr("foo/bar/egg", b"hello")
+                z.writestr("foo/spam", b"world")
+                z.writestr("foo/baz/", b"")
+                z.writestr("top.txt", b"top")
+            with zipfs.ReadZipFS(path) as zip_fs:
+                self.assertEqual(sorted(zip_fs.listdir("/")), ["foo", "top.txt"])
+                self.assertEqual(sorted(zip_fs.listdir("foo")), ["bar", "baz", "spam"])
+                self.assertEqual(zip_fs.listdir("foo/baz"), [])
+                self.assertTrue(zip_fs.isdir("foo/bar"))
+                self.assertFalse(zip_fs.isfile("foo/bar"))
+                self.assertTrue(zip_fs.exists("foo/spam"))
+                self.assertFalse(zip_fs.exists("foo/nothing"))
+                with self.assertRaises(errors.ResourceNotFound):
+                    zip_fs.listdir("nothing")
+                with self.assertRaises(errors.DirectoryExpected):
+                    zip_fs.listdir("top.txt")
+                with self.assertRaises(errors.ResourceNotFound):
+                    zip_fs.getinfo("foo/nothing")
+                self.assertTrue(zip_fs._directory.isfile("foo/bar/egg"))
+                self.assertTrue(zip_fs._directory.isdir("foo/baz"))
+                with self.assertRaises(TypeError):
+                    zip_fs.getinfo(b"foo")
+
+                namespaces = ["details", "access", "zip"]
+                for dir_path in ("/", "foo", "foo/bar"):
+                    scanned = [i.raw for i in zip_fs.scandir(dir_path, namespaces)]
+                    expected = [
+                        zip_fs.getinfo(join(dir_path, name), namespaces).raw
+                        for name in zip_fs.listdir(dir_path)
+                    ]
+                    self.assertEqual(scanned, expected)
+                paged = [i.name for i in zip_fs.scandir("foo", page=(1, 2))]
+                self.assertEqual(paged, zip_fs.listdir("foo")[1:2])
+                with self.assertRaises(errors.ResourceNotFound):
+                    list(zip_fs.scandir("nothing"))
+                with self.assertRaises(errors.DirectoryExpected):
+                    list(zip_fs.scandir("top.txt"))
+            with self.assertRaises(errors.FilesystemClosed):
+                zip_fs.listdir("foo")
+        finally:
+            os.remove(path)
+
+    def test_back_reference(self):
+        """Test zipfs raises consistently on names it cannot index."""
+        fh, path = tempfile.mkstemp("testzip.zip")
+        try:
+            os.close(fh)
+            with zipfile.ZipFile(path, mode="w") as z:
+                z.writestr("ok.txt", b"ok")
+                z.writestr("../evil.txt", b"evil")
+            with zipfs.ReadZipFS(path) as zip_fs:
+                for method in (
+                    zip_fs.exists,
+                    zip_fs.isfile,
+                    zip_fs.isdir,
+                    zip_fs.getinfo,
+                    zip_fs.openbin,
+                    zip_fs.readbytes,
+                ):
+                    with self.assertRaises(errors.IllegalBackReference):
+                        method("ok.txt")
+                with self.assertRaises(errors.IllegalBackReference):
+                    zip_fs.read_range("ok.txt", 0, 2)
+        finally:
+            os.remove(path)
+
 
 class TestOpener(unittest.TestCase):
     def test_not_writeable(self):